@@ -4,7 +4,10 @@ SeedLink and ArcLink client wrapper.
 
 import os
 import sys
+import shutil
+import asyncio
 import datetime
+import functools
 import tempfile
 import subprocess
 from contextlib import contextmanager
@@ -18,6 +21,173 @@ class LinkError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=None)
+def _python_cmd_exists(python_cmd):
+    """
+    Check whether Python executable path exists. The path is probed only once
+    per process, as it rarely changes between requests.
+    """
+    return os.path.isfile(python_cmd)
+
+
+def _silent_unlink(path):
+    """Remove file path, ignoring file that does not exist."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+# Maximum number of trailing bytes of process stdout and stderr kept in memory.
+_OUTPUT_TAIL_SIZE = 64 * 1024
+
+
+async def _read_tail(stream, limit):
+    if stream is None:
+        return None
+    tail = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        tail += chunk
+        if len(tail) > limit:
+            del tail[:-limit]
+    return bytes(tail)
+
+
+async def _feed_input(proc, data):
+    if data is None or proc.stdin is None:
+        return
+    try:
+        proc.stdin.write(data)
+        await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass
+    proc.stdin.close()
+
+
+async def _communicate(proc, data=None, limit=_OUTPUT_TAIL_SIZE):
+    """
+    Feed data to process stdin and consume its stdout and stderr incrementally
+    until the process exits.
+
+    Unlike :meth:`asyncio.subprocess.Process.communicate`, only the last limit
+    bytes of stdout and stderr are kept, so long transfers do not grow memory.
+    """
+    try:
+        stdout, stderr, _ = await asyncio.gather(
+            _read_tail(proc.stdout, limit),
+            _read_tail(proc.stderr, limit),
+            _feed_input(proc, data),
+        )
+        await proc.wait()
+    except BaseException:
+        # Do not leave the process running, e.g. when the task is cancelled.
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    return stdout, stderr
+
+
+async def _gather_or_cancel(aws):
+    """
+    Run awaitables concurrently like :func:`asyncio.gather`, but if any of them
+    fails, cancel and await the others before raising the error.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+# Request file templates, parsed once instead of on every request line.
+_DATE_TEMPLATE = "%04d,%02d,%02d,%02d,%02d,%02d"
+_LINE_PREFIX_TEMPLATE = "{} {} {} "
+_LINE_SUFFIX_TEMPLATE = " {}\n"
+
+
+def _format_datetime(date_obj):
+    """
+    Format datetime as YYYY,MM,DD,HH,MM,SS, i.e. strftime format
+    %Y,%m,%d,%H,%M,%S without going through strftime.
+    """
+    return _DATE_TEMPLATE % (
+        date_obj.year,
+        date_obj.month,
+        date_obj.day,
+        date_obj.hour,
+        date_obj.minute,
+        date_obj.second,
+    )
+
+
+def _to_datetime(value, name):
+    if isinstance(value, str):
+        return utils.to_pydatetime(value)
+    if isinstance(value, datetime.datetime):
+        return value
+    raise LinkError("Unsupported {} format".format(name))
+
+
+def _format_time_window(starttime, endtime, sep=" "):
+    return (
+        _format_datetime(_to_datetime(starttime, "starttime"))
+        + sep
+        + _format_datetime(_to_datetime(endtime, "endtime"))
+    )
+
+
+def _format_channel_lines(time_window, network, station, channel, location):
+    if isinstance(channel, (list, tuple)):
+        channels = channel
+    elif isinstance(channel, str):
+        channels = [channel]
+    else:
+        raise LinkError("Stream channel does not support {} type".format(type(channel)))
+
+    prefix = _LINE_PREFIX_TEMPLATE.format(time_window, network, station)
+    suffix = _LINE_SUFFIX_TEMPLATE.format(location)
+    return "".join(prefix + str(sta_channel) + suffix for sta_channel in channels)
+
+
+def format_request_lines(starttime, endtime, network, station, channel, location="00"):
+    """
+    Format ArcLink request file lines for single stream request.
+
+    It returns request lines as string, one line for each channel. See
+    :func:`build_request_file` for request file format.
+    """
+    return _format_channel_lines(
+        _format_time_window(starttime, endtime), network, station, channel, location
+    )
+
+
+def write_request_file(path, content, mode="a"):
+    """
+    Write ArcLink request lines to request file using single write call.
+    """
+    flags = os.O_WRONLY | os.O_CREAT
+    if mode == "a":
+        flags |= os.O_APPEND
+    elif mode == "w":
+        flags |= os.O_TRUNC
+    else:
+        raise LinkError("Unsupported request file mode {}".format(mode))
+
+    fd = os.open(path, flags, 0o600)
+    try:
+        os.write(fd, content.encode("utf-8"))
+    finally:
+        os.close(fd)
+    return path
+
+
 def build_request_file(
     starttime,
     endtime,
@@ -49,48 +219,61 @@ def build_request_file(
     information, see the following ArcLink CLI client documentation at
     https://www.seiscomp3.org/doc/jakarta/current/apps/arclink_fetch.html.
     """
-    date_format = "%Y,%m,%d,%H,%M,%S"
     if not request_file:
         filename = utils.generate_safe_random_filename()
         path = os.path.join(tempfile.gettempdir(), filename)
     else:
         path = request_file
 
-    if isinstance(starttime, str):
-        start = utils.to_pydatetime(starttime)
-    elif isinstance(starttime, datetime.datetime):
-        start = starttime
-    else:
-        raise LinkError("Unsupported starttime format")
+    content = format_request_lines(
+        starttime, endtime, network, station, channel, location=location
+    )
+    return write_request_file(path, content, mode=mode)
 
-    if isinstance(endtime, str):
-        end = utils.to_pydatetime(endtime)
-    elif isinstance(endtime, datetime.datetime):
-        end = endtime
-    else:
-        raise LinkError("Unsupported endtime format")
 
-    if isinstance(channel, (list, tuple)):
-        channels = channel
-    elif isinstance(channel, str):
-        channels = [channel]
-    else:
-        raise LinkError("Stream channel does not support {} type".format(type(channel)))
+def format_request_lines_batch(requests):
+    """
+    Format ArcLink request file lines for many request data at once.
 
-    with open(path, mode) as buf:
-        for sta_channel in channels:
-            buf.write(
-                "{starttime} {endtime} {network} "
-                "{station} {channel} {location}\n".format(
-                    starttime=start.strftime(date_format),
-                    endtime=end.strftime(date_format),
-                    network=network,
-                    station=station,
-                    channel=sta_channel,
-                    location=location,
-                )
+    Each request data is a dictionary with ``starttime``, ``endtime``,
+    ``network``, ``station``, ``channel``, and optional ``location`` keys. Time
+    window shared by many requests is formatted only once. See
+    :func:`build_request_file` for request file format.
+    """
+    time_windows = {}
+    lines = []
+    for request in requests:
+        key = (request["starttime"], request["endtime"])
+        time_window = time_windows.get(key)
+        if time_window is None:
+            time_window = time_windows[key] = _format_time_window(*key)
+
+        lines.append(
+            _format_channel_lines(
+                time_window,
+                request["network"],
+                request["station"],
+                request["channel"],
+                request.get("location", "00"),
             )
-    return path
+        )
+    return "".join(lines)
+
+
+def build_request_file_batch(requests, request_file=None, mode="w"):
+    """
+    Build ArcLink request file from many request data at once.
+
+    Request lines are formatted using :func:`format_request_lines_batch`, and
+    the whole request file is written using single write call.
+    """
+    if not request_file:
+        filename = utils.generate_safe_random_filename()
+        path = os.path.join(tempfile.gettempdir(), filename)
+    else:
+        path = request_file
+
+    return write_request_file(path, format_request_lines_batch(requests), mode=mode)
 
 
 class ArcLinkClient(object):
@@ -123,17 +306,46 @@ class ArcLinkClient(object):
         "user": None,
         "output_file": None,
     }
+    # Pairs of parameter name and its arclink_fetch command line option, in the
+    # order they are passed to arclink_fetch. Output file option is handled
+    # separately, because it changes on every request, and is followed by the
+    # request file.
+    _cli_options = tuple(
+        (name, "--" + name.replace("_", "-"))
+        for name in default_parameters
+        if name != "output_file"
+    )
     arclink_cli = "arclink_fetch"
     python_cmd = "/usr/bin/python"
+    # Base delay in seconds between retries of failed request by aexecute. The
+    # delay is doubled on every retry.
+    backoff_factor = 1.0
+    __slots__ = tuple(default_parameters) + (
+        "request_file",
+        "max_parallel",
+        "request_retries",
+        "output_path",
+        "request_data",
+        "_python_cmd",
+        "_semaphore",
+        "_cli_cache",
+        "persist_request_file",
+        # Instance dictionary is only created when class attributes such as
+        # python_cmd are overridden on instance.
+        "__dict__",
+    )
 
     def __init__(self, **kwargs):
         for key, value in self.default_parameters.items():
-            if key in kwargs:
-                new_value = kwargs[key]
-            else:
-                new_value = value
-            setattr(self, key, new_value)
+            setattr(self, key, kwargs.get(key, value))
+        self._python_cmd = None
+        self._cli_cache = None
         self.request_file = kwargs.pop("request_file", None)
+        self.max_parallel = kwargs.pop("max_parallel", 5)
+        # arclink_fetch already retries failed requests itself, see retries
+        # parameter, so aexecute does not start the process again by default.
+        self.request_retries = kwargs.pop("request_retries", 0)
+        self.persist_request_file = kwargs.pop("persist_request_file", True)
         self.output_path = kwargs.pop("output_path", None)
         self.request_data = []
 
@@ -143,8 +355,12 @@ class ArcLinkClient(object):
             if not getattr(self, name):
                 raise LinkError("Parameter {} is required".format(name))
 
-        if not os.path.isfile(self.python_cmd):
-            self.python_cmd = utils.find_executable("python")
+        if _python_cmd_exists(self.python_cmd):
+            self._python_cmd = None
+        else:
+            # Keep the fallback separate, so that python_cmd stays as set on
+            # class, subclass, or instance.
+            self._python_cmd = utils.find_executable("python")
             assert sys.version_info < (3, 0), (
                 "Python version 2.x is required to run arclink_fetch. "
                 "Make sure you have Python version 2.x installed. "
@@ -163,59 +379,61 @@ class ArcLinkClient(object):
             if item.get(name) is None:
                 raise LinkError("Request parameter {} is required".format(name))
 
-    def _build_request_file(self):
-        if os.path.exists(self.request_file):
-            os.unlink(self.request_file)
-
+    def _build_request_file(self, buf=None):
         for request in self.request_data:
             self._check_request_parameters(request)
-
-            build_request_file(
-                request["starttime"],
-                request["endtime"],
-                request["network"],
-                request["station"],
-                request["channel"],
-                location=request.get("location", "00"),
-                request_file=self.request_file,
-                mode="a",
-            )
+        if buf is not None:
+            # Write request lines to file-like object instead of request file.
+            buf.write(format_request_lines_batch(self.request_data))
+            return buf
+        return build_request_file_batch(
+            self.request_data, request_file=self.request_file
+        )
 
     def _build_cli(self):
         arclink_cmd = utils.find_executable(self.arclink_cli)
         if arclink_cmd is None:
             raise LinkError("Could not find arclink_fetch executable")
-        return [self.python_cmd, arclink_cmd]
+        return [self._python_cmd or self.python_cmd, arclink_cmd]
 
-    def _build_cli_arguments(self):
+    def _build_cli_arguments(self, request_file=None, output_file=None):
         if self.output_path is None:
             self.output_path = tempfile.gettempdir()
         if self.request_file is None:
             self.request_file = os.path.join(
                 self.output_path, utils.generate_safe_random_filename()
             )
-        output_file = utils.generate_safe_random_filename(self.data_format)
         if self.output_file is None:
-            self.output_file = os.path.join(self.output_path, output_file)
-
-        args = []
-        underscore = "_"
-        dash = "-"
-        for name in self.default_parameters:
-            value = getattr(self, name)
-            if value:
-                if isinstance(value, bool):
-                    arg_format = "--{name}"
-                else:
-                    arg_format = "--{name}={value}"
-
-                args.append(
-                    arg_format.format(name=name.replace(underscore, dash), value=value)
-                )
-        return args + [self.request_file]
+            self.output_file = os.path.join(
+                self.output_path, utils.generate_safe_random_filename(self.data_format)
+            )
 
-    def _build_cli_with_arguments(self):
-        return self._build_cli() + self._build_cli_arguments()
+        # Options other than output file rarely change between requests, so
+        # reuse their formatted arguments while parameter values are the same.
+        # Value types are compared too, since values such as True and 1 are
+        # equal but formatted differently.
+        values = tuple(getattr(self, name) for name, _ in self._cli_options)
+        key = tuple((type(value), value) for value in values)
+        if self._cli_cache is None or self._cli_cache[0] != key:
+            options = []
+            for (name, option), value in zip(self._cli_options, values):
+                if value:
+                    if isinstance(value, bool):
+                        options.append(option)
+                    else:
+                        options.append(option + "=" + str(value))
+            self._cli_cache = (key, options)
+
+        args = list(self._cli_cache[1])
+        output_file = output_file or self.output_file
+        if output_file:
+            args.append("--output-file=" + str(output_file))
+        return args + [request_file or self.request_file]
+
+    def _build_cli_with_arguments(self, request_file=None, output_file=None):
+        return self._build_cli() + self._build_cli_arguments(
+            request_file=request_file, output_file=output_file
+        )
 
     def request(self, **kwargs):
         """
@@ -241,18 +459,163 @@ class ArcLinkClient(object):
         """Clear all ArcLink request data."""
         self.request_data.clear()
 
-    def execute(self, **kwargs):
-        """Execute ArcLink request."""
+    async def _execute_one(self, cli, content, request_file, output_file, **kwargs):
+        """
+        Run single ArcLink request lines on its own request file and output
+        file. Both files are removed with the temporary directory of
+        :meth:`aexecute`.
+        """
+        if self.persist_request_file:
+            write_request_file(request_file, content, mode="w")
+            request_input = None
+        else:
+            # Pass request lines through stdin instead of temporary file.
+            request_file = "-"
+            request_input = content.encode("utf-8")
+            kwargs["stdin"] = asyncio.subprocess.PIPE
+
+        cli_with_args = cli + self._build_cli_arguments(
+            request_file=request_file, output_file=output_file
+        )
+        kwargs.setdefault("stdout", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stderr", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stdin", asyncio.subprocess.DEVNULL)
+        kwargs.setdefault("close_fds", False)
+        for attempt in range(int(self.request_retries or 0) + 1):
+            if attempt:
+                # Wait outside the semaphore, so that other requests can run in
+                # the meantime.
+                await asyncio.sleep(self.backoff_factor * 2 ** (attempt - 1))
+                _silent_unlink(output_file)
+
+            async with self._semaphore:
+                proc = await asyncio.create_subprocess_exec(*cli_with_args, **kwargs)
+                stdout, stderr = await _communicate(proc, request_input)
+            if proc.returncode == 0:
+                break
+
+        completed_process = subprocess.CompletedProcess(
+            cli_with_args, proc.returncode, stdout=stdout, stderr=stderr
+        )
+        return completed_process, output_file
+
+    def _merge_output_files(self, output_files):
+        """
+        Concatenate per-request output files into client output file.
+
+        miniSEED records are self-contained, so output files can be joined
+        byte-wise without decoding. Single output file is moved instead of
+        copied if it is on the same file system.
+        """
+        if len(output_files) == 1:
+            try:
+                os.replace(output_files[0], self.output_file)
+                return
+            except FileNotFoundError:
+                # Failed request leaves no output, so output file is empty.
+                open(self.output_file, "wb").close()
+                return
+            except OSError:
+                pass
+
+        with open(self.output_file, "wb") as dest:
+            for path in output_files:
+                try:
+                    src = open(path, "rb")
+                except FileNotFoundError:
+                    continue
+                with src:
+                    shutil.copyfileobj(src, dest)
+
+    async def aexecute(self, **kwargs):
+        """
+        Execute ArcLink request concurrently.
+
+        Each request data entry is fetched by its own ``arclink_fetch`` process
+        and the results are merged into ``output_file`` in request order. At
+        most ``max_parallel`` processes run at the same time. Failed requests
+        are started again up to ``request_retries`` times with exponential
+        backoff, on top of ``retries`` done by ``arclink_fetch`` itself.
+        It returns list of :class:`subprocess.CompletedProcess`, one for each
+        request data entry. Process output is consumed incrementally and only
+        the last 64 KiB of stdout and stderr are kept.
+        """
         self._check_required()
-        cli_with_args = self._build_cli_with_arguments()
-        safe_cli_with_args = utils.stringify_parameters(cli_with_args)
+        # Validate and format all request data before starting any process, so
+        # that invalid entry does not leave other requests running.
+        contents = []
+        for request in self.request_data:
+            self._check_request_parameters(request)
+            contents.append(
+                format_request_lines(
+                    request["starttime"],
+                    request["endtime"],
+                    request["network"],
+                    request["station"],
+                    request["channel"],
+                    location=request.get("location", "00"),
+                )
+            )
+        cli = self._build_cli()
+        self._build_cli_arguments()
+        self._semaphore = asyncio.Semaphore(self.max_parallel)
+
+        # Per-request files live in private temporary directory, so that they
+        # do not need unique random names and are removed at once, even if a
+        # request fails or the task is cancelled. Other requests are cancelled
+        # before the directory is removed.
+        with tempfile.TemporaryDirectory(dir=self.output_path) as tmpdir:
+            results = await _gather_or_cancel(
+                self._execute_one(
+                    cli,
+                    content,
+                    os.path.join(tmpdir, "{}.txt".format(index)),
+                    os.path.join(tmpdir, "{}.{}".format(index, self.data_format)),
+                    **kwargs
+                )
+                for index, content in enumerate(contents)
+            )
+            # Copying large output files must not block other coroutines.
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(
+                None,
+                self._merge_output_files,
+                [output_file for _, output_file in results],
+            )
+        return [completed_process for completed_process, _ in results]
 
-        self._build_request_file()
-        if sys.version_info < (3, 5):
-            completed_process = subprocess.call(safe_cli_with_args, **kwargs)
+    def execute(self, **kwargs):
+        """
+        Execute ArcLink request.
+
+        All request data entries are written into one request file and fetched
+        by single ``arclink_fetch`` process. If ``persist_request_file`` is
+        False, request lines are passed through stdin instead. Keyword
+        arguments are passed to :func:`subprocess.run`, and it returns
+        :class:`subprocess.CompletedProcess`. Use :meth:`aexecute` to fetch
+        request data entries concurrently.
+        """
+        self._check_required()
+        if self.persist_request_file:
+            cli_with_args = self._build_cli_with_arguments()
+            self._build_request_file()
+            kwargs.setdefault("stdin", subprocess.DEVNULL)
         else:
-            completed_process = subprocess.run(safe_cli_with_args, **kwargs)
-        return completed_process
+            # Pass request lines through stdin instead of request file.
+            cli_with_args = self._build_cli_with_arguments(request_file="-")
+            for request in self.request_data:
+                self._check_request_parameters(request)
+            content = format_request_lines_batch(self.request_data)
+            text_mode = any(
+                kwargs.get(name)
+                for name in ("universal_newlines", "text", "encoding", "errors")
+            )
+            kwargs.setdefault(
+                "input", content if text_mode else content.encode("utf-8")
+            )
+
+        kwargs.setdefault("close_fds", False)
+        return subprocess.run(cli_with_args, **kwargs)
 
 
 class SeedLinkClient(object):
@@ -281,14 +644,16 @@ class SeedLinkClient(object):
         "output_path": None,
     }
     seedlink_cli = "slinktool"
+    __slots__ = tuple(default_parameters) + (
+        "request_data",
+        # Instance dictionary is only created when class attributes such as
+        # seedlink_cli are overridden on instance.
+        "__dict__",
+    )
 
     def __init__(self, **kwargs):
         for key, value in self.default_parameters.items():
-            if key in kwargs:
-                new_value = kwargs[key]
-            else:
-                new_value = value
-            setattr(self, key, new_value)
+            setattr(self, key, kwargs.get(key, value))
 
         self.request_data = {"streams": [], "starttime": None, "endtime": None}
 
@@ -310,50 +675,26 @@ class SeedLinkClient(object):
             if not item.get(name):
                 raise LinkError("Request parameter {} is required".format(name))
 
+    @staticmethod
+    def _format_stream(stream):
+        channel = stream.get("channel")
+        netsta = "{}_{}".format(stream["network"], stream["station"])
+        if isinstance(channel, (list, tuple)):
+            return netsta + ":" + " ".join(map(str, channel))
+        if isinstance(channel, str):
+            return netsta + ":" + channel
+        return netsta
+
     def _build_stream_list(self):
-        streams = []
-        selector_template = ":{channel}"
-        for stream in self.request_data["streams"]:
+        streams = self.request_data["streams"]
+        for stream in streams:
             self._check_netsta(stream)
-
-            network = stream.get("network")
-            station = stream.get("station")
-            channel = stream.get("channel")
-            netsta = "{network}_{station}".format(network=network, station=station)
-
-            if isinstance(channel, (list, tuple)):
-                selector = selector_template.format(channel=" ".join(map(str, channel)))
-            elif isinstance(channel, str):
-                selector = selector_template.format(channel=channel)
-            else:
-                selector = ""
-            streams.append(netsta + selector)
-        return ",".join(map(str, streams))
+        return ",".join(self._format_stream(stream) for stream in streams)
 
     def _build_time_window(self):
-        starttime = self.request_data["starttime"]
-        endtime = self.request_data["endtime"]
-
-        if isinstance(starttime, str):
-            start = utils.to_pydatetime(starttime)
-        elif isinstance(starttime, datetime.datetime):
-            start = starttime
-        else:
-            raise LinkError("Unsupported starttime format")
-
-        if isinstance(endtime, str):
-            end = utils.to_pydatetime(endtime)
-        elif isinstance(endtime, datetime.datetime):
-            end = endtime
-        else:
-            raise LinkError("Unsupported endtime format")
-
-        date_format = r"%Y,%m,%d,%H,%M,%S"
-        time_window = "{starttime}:{endtime}".format(
-            starttime=start.strftime(date_format),
-            endtime=end.strftime(date_format) if end else "",
+        return _format_time_window(
+            self.request_data["starttime"], self.request_data["endtime"], sep=":"
         )
-        return time_window
 
     def _build_cli(self):
         seedlink_cmd = utils.find_executable(self.seedlink_cli)
@@ -373,16 +714,16 @@ class SeedLinkClient(object):
             self.output_file = os.path.join(self.output_path, output_file)
         return [
             "-nd",
-            self.delay,
+            str(self.delay),
             "-nt",
-            self.timeout,
+            str(self.timeout),
             "-tw",
             self.time_window,
             "-S",
             self.stream_list,
             "-o",
             self.output_file,
-            self.address,
+            str(self.address),
         ]
 
     def _build_cli_with_arguments(self):
@@ -433,13 +774,77 @@ class SeedLinkClient(object):
         cli_with_args = self._build_cli_with_arguments()
         self._check_required()
 
-        safe_cli_with_args = utils.stringify_parameters(cli_with_args)
+        # File descriptors created by Python are non-inheritable (PEP 446), so
+        # skipping the close_fds loop in the child is safe. Subclasses that
+        # open inheritable descriptors should pass close_fds=True explicitly.
+        kwargs.setdefault("stdin", subprocess.DEVNULL)
+        kwargs.setdefault("close_fds", False)
+        return subprocess.run(cli_with_args, **kwargs)
 
-        if sys.version_info < (3, 5):
-            completed_process = subprocess.call(safe_cli_with_args, **kwargs)
-        else:
-            completed_process = subprocess.run(safe_cli_with_args, **kwargs)
-        return completed_process
+    async def aexecute(self, **kwargs):
+        """
+        Execute SeedLink request without blocking the event loop.
+
+        slinktool handles a single time window per process, so its connection
+        can not be reused across requests. Instead, requests of many clients
+        can be awaited concurrently, so that the server handshakes overlap. It
+        returns :class:`subprocess.CompletedProcess` holding the last 64 KiB of
+        stdout and stderr.
+        """
+        self._check_request_parameters()
+        cli_with_args = self._build_cli_with_arguments()
+        self._check_required()
+
+        kwargs.setdefault("stdout", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stderr", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stdin", asyncio.subprocess.DEVNULL)
+        kwargs.setdefault("close_fds", False)
+
+        proc = await asyncio.create_subprocess_exec(*cli_with_args, **kwargs)
+        stdout, stderr = await _communicate(proc)
+        return subprocess.CompletedProcess(
+            cli_with_args, proc.returncode, stdout=stdout, stderr=stderr
+        )
+
+
+async def gather_many(clients, max_concurrency=5, **kwargs):
+    """
+    Execute requests of many ArcLink or SeedLink clients concurrently.
+
+    At most ``max_concurrency`` clients are executed at the same time. Extra
+    keyword arguments are passed to each client ``aexecute`` method. It returns
+    list of ``aexecute`` results in the same order as ``clients``. If any
+    client fails, requests of other clients are cancelled and the error is
+    raised.
+
+    Example:
+
+    .. code-block:: python
+
+        import asyncio
+        from richter import SeedLinkClient, gather_many
+
+        clients = []
+        for hour in range(24):
+            client = SeedLinkClient(address='192.168.0.25:18000')
+            client.request(
+                starttime='2019-01-01 {:02d}:00:00'.format(hour),
+                endtime='2019-01-01 {:02d}:59:59'.format(hour),
+                network='VG',
+                station='MEPAS',
+            )
+            clients.append(client)
+
+        loop = asyncio.get_event_loop()
+        processes = loop.run_until_complete(gather_many(clients))
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def execute(client):
+        async with semaphore:
+            return await client.aexecute(**kwargs)
+
+    return await _gather_or_cancel(execute(client) for client in clients)
 
 
 @contextmanager
@@ -477,7 +882,66 @@ def stream_manager(**kwargs):
         client.execute()
         yield client.output_file
     finally:
-        if os.path.exists(client.output_file):
-            os.unlink(client.output_file)
-        if os.path.exists(client.request_file):
-            os.unlink(client.request_file)
+        _silent_unlink(client.output_file)
+        _silent_unlink(client.request_file)
+
+
+class _AsyncStreamManager(object):
+    """Asynchronous context manager of ArcLinkClient class."""
+
+    def __init__(self, **kwargs):
+        address = kwargs.pop("address", None)
+        if address is None:
+            raise LinkError("Parameter address is required")
+
+        self.client = ArcLinkClient(address=address, user="user", data_format="mseed")
+        self.client.request_many(**kwargs)
+
+    async def __aenter__(self):
+        try:
+            await self.client.aexecute()
+        except BaseException:
+            await self._cleanup()
+            raise
+        return self.client.output_file
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._cleanup()
+
+    async def _cleanup(self):
+        loop = asyncio.get_event_loop()
+        for path in (self.client.output_file, self.client.request_file):
+            if path:
+                await loop.run_in_executor(None, _silent_unlink, path)
+
+
+def async_stream_manager(**kwargs):
+    """
+    Asynchronous context manager of ArcLinkClient class.
+
+    It works like :func:`stream_manager`, but awaits the request, so that many
+    time windows can be fetched concurrently.
+
+    Example:
+
+    .. code-block:: python
+
+        import asyncio
+        from obspy import read
+        from richter import async_stream_manager
+
+        async def fetch(starttime, endtime):
+            async with async_stream_manager(address='192.168.0.25:18001',
+                                            starttime=starttime,
+                                            endtime=endtime, network='VG',
+                                            station='MEPAS',
+                                            channel='HHZ') as stream_file:
+                return read(stream_file)
+
+        async def main():
+            return await asyncio.gather(
+                fetch('2019-01-01 00:00:00', '2019-01-01 01:00:00'),
+                fetch('2019-01-01 01:00:00', '2019-01-01 02:00:00'),
+            )
+    """
+    return _AsyncStreamManager(**kwargs)
@@ -3,8 +3,31 @@ Utility module for computing Richter magnitude scales, i.e. ML or local
 magnitude on BPPTKG seismic network.
 """
 
+import os
+import math
+import shutil
+import hashlib
+import tempfile
+import functools
+
 import numpy as np
 from . import paz
+from .version import __version__
+
+# Correction factors k1, k2, and k3 that map DEL (Deles) analog amplitude scale
+# to PUS amplitude scale, folded together with peak-to-peak to zero-to-peak
+# conversion into single constant.
+_ANALOG_AMPLITUDE_FACTOR = (
+    (2800 / (0.13 * 27000)) * (20.0 / 50.0) * (3981.0 / 7943.0) / 2.0
+)
+
+# numpy.fft computes single precision input in single precision since numpy 2.
+# Earlier versions compute in double precision anyway, so simulating in single
+# precision would only cost accuracy.
+_SINGLE_PRECISION_FFT = int(np.__version__.split(".")[0]) >= 2
+
+# Maximum number of traces simulated together in compute_ml_batch.
+_BATCH_SIZE = 64
 
 
 def filter_stream(stream, **kwargs):
@@ -29,8 +52,9 @@ def filter_stream(stream, **kwargs):
         print(filtered_stream)
 
     """
-    filtered_stream = stream.copy().select(**kwargs)
-    if filtered_stream.count() > 1:
+    # Select before copying, so that only matched traces are duplicated.
+    filtered_stream = stream.select(**kwargs).copy()
+    if len(filtered_stream.traces) > 1:
         filtered_stream.merge(method=1, fill_value="interpolate")
     return filtered_stream
 
@@ -42,10 +66,11 @@ def compute_bpptkg_ml(wa_ampl):
     Note that Wood Anderson zero to peak amplitude (wa_ampl) is in mm.
     Calibration function log10(A0) for BPPTKG seismic network is -1.4.
 
-    :param wa_ampl: Wood-Anderson zero to peak amplitude in mili-meter.
-    :type wa_ampl: float
+    :param wa_ampl: Wood-Anderson zero to peak amplitude in mili-meter. It can
+        also be a list or array of amplitudes.
+    :type wa_ampl: float, list, or :class:`numpy.ndarray`
     :return: BPPTKG Richter magnitude scale.
-    :rtype: float
+    :rtype: float or :class:`numpy.ndarray`
 
     Richter magnitude scale is computed using the following equation: ::
 
@@ -65,11 +90,20 @@ def compute_bpptkg_ml(wa_ampl):
         ml = compute_bpptkg_ml(wa_ampl)
         print(ml)
 
+        magnitudes = compute_bpptkg_ml([0.5, 5, 50])
+        print(magnitudes)
+
     """
+    if isinstance(wa_ampl, (list, tuple)):
+        wa_ampl = np.asarray(wa_ampl, dtype=np.float64)
+    # Scalar amplitude skips numpy ufunc dispatch. Zero, negative, and array
+    # amplitudes keep numpy semantics, i.e. -inf or nan instead of error.
+    if isinstance(wa_ampl, (int, float)) and wa_ampl > 0:
+        return math.log10(wa_ampl) + 1.4
     return np.log10(wa_ampl) + 1.4
 
 
-def compute_wa(stream, station, network="VG", component="Z", **kwargs):
+def compute_wa(stream, station, network="VG", component="Z", cache=False, **kwargs):
     """
     Compute stream Wood-Anderson amplitude in meter.
 
@@ -81,6 +115,11 @@ def compute_wa(stream, station, network="VG", component="Z", **kwargs):
     :type network: str
     :param component: Seismic station component, e.g E, N, Z, default to Z.
     :type component: str
+    :param cache: If True, cache the result on disk keyed by station, component,
+        trace time window, and trace data hash, so that computing the same trace
+        again skips Wood-Anderson simulation. Default to False. Cache directory
+        is ``~/.cache/richter`` or ``RICHTER_CACHE_DIR`` environment variable.
+    :type cache: bool
     :return: Wood-Anderson zero to peak amplitude in meter.
     :rtype: float
 
@@ -101,15 +140,242 @@ def compute_wa(stream, station, network="VG", component="Z", **kwargs):
     )
     if not filtered_stream:
         return None
-    filtered_stream.simulate(
-        paz_remove=paz.get_paz(station, component),
-        paz_simulate=paz.PAZ["WOOD_ANDERSON"],
-        water_level=0.0,
-    )
-    wa_ampl = np.max(np.abs(filtered_stream[0].data))
+
+    if cache:
+        cache_path = _wa_cache_path(filtered_stream[0], station, component)
+        wa_ampl = _read_wa_cache(cache_path)
+        if wa_ampl is not None:
+            return wa_ampl
+
+    trace = _simulate_wa(filtered_stream[0], station, component)
+    wa_ampl = np.float64(_abs_max(trace.data))
+
+    if cache:
+        _write_wa_cache(cache_path, wa_ampl)
     return wa_ampl
 
 
+def _get_cache_dir():
+    return os.environ.get(
+        "RICHTER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "richter")
+    )
+
+
+def _wa_cache_path(trace, station, component):
+    data = np.ascontiguousarray(trace.data)
+    key = hashlib.sha1()
+    key.update(
+        "{version} {station} {component} {id} {starttime} {sampling_rate} "
+        "{npts} {dtype}".format(
+            version=__version__,
+            station=station,
+            component=component.upper(),
+            id=trace.id,
+            starttime=trace.stats.starttime,
+            sampling_rate=trace.stats.sampling_rate,
+            npts=trace.stats.npts,
+            dtype=data.dtype.str,
+        ).encode("utf-8")
+    )
+    key.update(data.view(np.uint8))
+    return os.path.join(_get_cache_dir(), "wa", key.hexdigest())
+
+
+def _read_wa_cache(path):
+    try:
+        with open(path, "r") as buf:
+            return np.float64(buf.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_wa_cache(path, wa_ampl):
+    dirname = os.path.dirname(path)
+    try:
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=dirname)
+        with os.fdopen(fd, "w") as buf:
+            buf.write(repr(float(wa_ampl)))
+        os.replace(tmp_path, path)
+    except OSError:
+        # Cache is best effort, computing the amplitude must not fail because
+        # of it.
+        pass
+
+
+def clear_wa_cache():
+    """
+    Remove all cached Wood-Anderson amplitudes computed with ``cache=True``.
+
+    Example:
+
+    .. code-block:: python
+
+        from richter import clear_wa_cache
+
+        clear_wa_cache()
+
+    """
+    shutil.rmtree(os.path.join(_get_cache_dir(), "wa"), ignore_errors=True)
+
+
+def _min_max(data):
+    """Get minimum and maximum value of data."""
+    return data.min(), data.max()
+
+
+def _abs_max(data):
+    """
+    Get maximum absolute value of data without allocating temporary absolute
+    value array.
+    """
+    lo, hi = _min_max(data)
+    return max(-lo, hi)
+
+
+def _simulate_wa(trace, station, component):
+    """
+    Simulate Wood-Anderson seismometer on trace in place and return the trace.
+
+    It follows :meth:`obspy.core.trace.Trace.simulate` with zero water level,
+    but reuses the cached frequency response of the station for traces with the
+    same sampling rate and number of samples. On numpy 2 or later, integer
+    counts of at most 32 bits are simulated in single precision after removing
+    the mean in double precision, which is accurate enough for amplitude and
+    magnitude computation and halves memory traffic.
+    """
+    single = _use_single_precision(trace.data)
+    data = _demean(trace.data, single)
+    trace.data = _simulate_wa_data(
+        data, station, component, trace.stats.sampling_rate, single
+    )
+    return trace
+
+
+def _use_single_precision(data):
+    return (
+        _SINGLE_PRECISION_FFT and data.dtype.kind in "iu" and data.dtype.itemsize <= 4
+    )
+
+
+def _demean(data, single, copy=True):
+    """
+    Remove mean of data on the last axis in double precision, then cast it to
+    single precision if single is True, so that large DC offset does not cost
+    precision of the signal.
+    """
+    data = data.astype(np.float64, copy=copy)
+    data -= data.mean(axis=-1, keepdims=True)
+    if single:
+        data = data.astype(np.float32)
+    return data
+
+
+def _simulate_wa_data(data, station, component, sampling_rate, single):
+    """
+    Simulate Wood-Anderson seismometer on demeaned floating point data,
+    overwriting it.
+
+    Samples are on the last axis, so data can also be 2D array of traces with
+    the same sampling rate and number of samples.
+    """
+    npts = data.shape[-1]
+    nfft, taper, response, scale = _wa_response(
+        station, component, sampling_rate, npts, single=single
+    )
+
+    data *= taper
+    spectrum = np.fft.rfft(data, n=nfft)
+    spectrum *= response
+    spectrum[..., -1] = abs(spectrum[..., -1]) + 0.0j
+    data = np.fft.irfft(spectrum)[..., 0:npts]
+
+    # Same as obspy.signal.invsim.simple_detrend, i.e. subtract line through
+    # the first and last sample, but for each trace on the last axis.
+    first = data[..., :1]
+    last = data[..., -1:]
+    data -= first + np.arange(npts) * (last - first) / float(npts - 1)
+    data *= scale
+    return data
+
+
+def _wa_response(station, component, sampling_rate, npts, single=False):
+    """
+    Compute cosine taper, combined frequency response of removing station
+    response and simulating Wood-Anderson seismometer, and overall sensitivity
+    scale factor. If single is True, taper and response are cast to single
+    precision.
+
+    The result is cached on the PAZ values themselves, not on station name, so
+    changes of :data:`richter.paz.PAZ` are picked up on the next call.
+    """
+    return _cached_wa_response(
+        _paz_key(paz.get_paz(station, component)),
+        _paz_key(paz.PAZ["WOOD_ANDERSON"]),
+        1.0 / sampling_rate,
+        npts,
+        single,
+    )
+
+
+def _paz_key(paz_info):
+    return (
+        tuple(paz_info["poles"]),
+        tuple(paz_info["zeros"]),
+        paz_info["gain"],
+        paz_info["sensitivity"],
+    )
+
+
+def _npts_to_nfft(npts):
+    """
+    Get number of FFT points for npts samples, the same way as ObsPy does when
+    simulating seismometer, i.e. at least twice npts, rounded up to number
+    without large prime factors.
+    """
+    nfft = 2 * (npts + (npts & 1))
+    if nfft <= 5000 or _max_prime_factor(nfft) < 500:
+        return nfft
+    for trial in range(nfft + 2, nfft + 22, 2):
+        if _max_prime_factor(trial) < 500:
+            return trial
+    return 1 << (nfft - 1).bit_length()
+
+
+def _max_prime_factor(n):
+    factor = 2
+    largest = 1
+    while factor * factor <= n:
+        while n % factor == 0:
+            largest = factor
+            n //= factor
+        factor += 1
+    return max(largest, n)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_wa_response(paz_remove, paz_simulate, delta, npts, single):
+    from obspy.signal.invsim import cosine_taper, invert_spectrum, paz_to_freq_resp
+
+    poles, zeros, gain, sensitivity = paz_remove
+    wa_poles, wa_zeros, wa_gain, wa_sensitivity = paz_simulate
+    nfft = _npts_to_nfft(npts)
+
+    response = paz_to_freq_resp(list(poles), list(zeros), gain, delta, nfft)
+    invert_spectrum(response, 0.0)
+    response *= paz_to_freq_resp(list(wa_poles), list(wa_zeros), wa_gain, delta, nfft)
+    taper = cosine_taper(npts, 0.05)
+    scale = wa_sensitivity / sensitivity
+    if single:
+        response = response.astype(np.complex64)
+        taper = taper.astype(np.float32)
+
+    # Cached arrays are shared between calls.
+    response.setflags(write=False)
+    taper.setflags(write=False)
+    return nfft, taper, response, scale
+
+
 def compute_ml(stream, station, network="VG", component="Z", **kwargs):
     """
     Compute Richter magnitude scales.
@@ -140,13 +406,159 @@ def compute_ml(stream, station, network="VG", component="Z", **kwargs):
     wa_ampl = compute_wa(
         stream, station, network=network, component=component, **kwargs
     )
-    if not wa_ampl:
-        return None
+    return _compute_ml_from_wa(wa_ampl)
+
+
+def compute_ml_from_trace(trace, station, component="Z"):
+    """
+    Compute Richter magnitude scales from single trace.
+
+    Unlike :func:`compute_ml`, the trace is not selected and merged from stream,
+    so callers that already have the trace of the station skip stream
+    filtering. The trace itself is not modified.
+
+    :param trace: ObsPy waveform trace object.
+    :type trace: :class:`obspy.core.trace.Trace`
+    :param station: Seismic station name, e.g. MEPAS, MEGRA, etc.
+    :type station: str
+    :param component: Seismic station component, e.g E, N, Z, default to Z.
+    :type component: str
+    :return: BPPTKG Richter magnitude scale.
+    :rtype: float
+
+    Example:
+
+    .. code-block:: python
+
+        from richter import compute_ml_from_trace
+        from obspy import read
+
+        stream = read('/path/to/stream.msd')
+        ml = compute_ml_from_trace(stream[0], 'MEPAS', component='Z')
+        print(ml)
+
+    """
+    # Demeaning copies the data, so the trace itself needs no copy.
+    single = _use_single_precision(trace.data)
+    data = _simulate_wa_data(
+        _demean(trace.data, single),
+        station,
+        component,
+        trace.stats.sampling_rate,
+        single,
+    )
+    return _compute_ml_from_wa(np.float64(_abs_max(data)))
+
+
+def compute_ml_batch(
+    streams, station, network="VG", component="Z", cache=False, **kwargs
+):
+    """
+    Compute Richter magnitude scales of many streams, e.g. for whole catalog of
+    events.
+
+    It gives the same result as calling :func:`compute_ml` on each stream, but
+    traces with the same sampling rate and number of samples are simulated
+    together as 2D array, so the Wood-Anderson response is applied in single
+    numpy call for each group instead of once for each stream.
+
+    :param streams: List of ObsPy waveform stream objects.
+    :type streams: list
+    :param station: Seismic station name, e.g. MEPAS, MEGRA, etc.
+    :type station: str
+    :param network: Seismic network name, default to VG.
+    :type network: str
+    :param component: Seismic station component, e.g E, N, Z, default to Z.
+    :type component: str
+    :param cache: If True, use the same on disk cache of Wood-Anderson
+        amplitudes as :func:`compute_wa`, so that only traces without cached
+        amplitude are simulated. Default to False.
+    :type cache: bool
+    :return: Array of BPPTKG Richter magnitude scales, one for each stream. It
+        is nan for stream without trace of the station or with zero amplitude.
+    :rtype: :class:`numpy.ndarray`
+
+    Example:
+
+    .. code-block:: python
+
+        from richter import compute_ml_batch
+        from obspy import read
+
+        streams = [read(path) for path in ['/path/to/a.msd', '/path/to/b.msd']]
+        magnitudes = compute_ml_batch(streams, 'MEPAS', component='Z')
+        print(magnitudes)
+
+    """
+    wa_ampl = np.zeros(len(streams))
+    groups = {}
+    cache_paths = {}
+    for index, stream in enumerate(streams):
+        trace = _select_trace(
+            stream, station=station, network=network, component=component, **kwargs
+        )
+        if trace is None:
+            continue
+        if cache:
+            cache_path = _wa_cache_path(trace, station, component)
+            cached = _read_wa_cache(cache_path)
+            if cached is not None:
+                wa_ampl[index] = cached
+                continue
+            cache_paths[index] = cache_path
+        key = (
+            trace.stats.sampling_rate,
+            trace.stats.npts,
+            _use_single_precision(trace.data),
+        )
+        groups.setdefault(key, []).append((index, trace.data))
+
+    for (sampling_rate, npts, single), items in groups.items():
+        # Bound the size of 2D array, since each row also needs its spectrum.
+        for start in range(0, len(items), _BATCH_SIZE):
+            chunk = items[start : start + _BATCH_SIZE]
+            data = np.empty((len(chunk), npts), dtype=np.float64)
+            for row, (_, trace_data) in enumerate(chunk):
+                data[row] = trace_data
+            data = _demean(data, single, copy=False)
+            data = _simulate_wa_data(data, station, component, sampling_rate, single)
+            lo = data.min(axis=-1)
+            hi = data.max(axis=-1)
+            wa_ampl[[index for index, _ in chunk]] = np.maximum(-lo, hi)
+
+    for index, cache_path in cache_paths.items():
+        _write_wa_cache(cache_path, wa_ampl[index])
+
+    richter_ml = np.full(len(streams), np.nan)
+    mask = wa_ampl > 0
     # Convert WA amplitude from meter to mili-meter
-    richter_ml = compute_bpptkg_ml(wa_ampl * 1000)
+    richter_ml[mask] = compute_bpptkg_ml(wa_ampl[mask] * 1000)
     return richter_ml
 
 
+def _select_trace(stream, **kwargs):
+    """
+    Select trace like :func:`filter_stream`, but without copying the trace if
+    it does not need to be merged, since the data is not modified.
+    """
+    selected = stream.select(**kwargs)
+    if not selected:
+        return None
+    if len(selected.traces) > 1:
+        selected = selected.copy()
+        selected.merge(method=1, fill_value="interpolate")
+    return selected[0]
+
+
+def _compute_ml_from_wa(wa_ampl):
+    if not wa_ampl:
+        return None
+    # Same as compute_bpptkg_ml(wa_ampl * 1000), i.e. converting WA amplitude
+    # from meter to mili-meter, with log10(1000) folded into calibration
+    # constant 1.4. Amplitude is maximum absolute value, so it is positive.
+    return math.log10(wa_ampl) + 4.4
+
+
 def compute_analog_ml(p2p_amplitude):
     """
     Compute Richter magnitude scales from seismic analog peak-to-peak amplitude.
@@ -154,10 +566,11 @@ def compute_analog_ml(p2p_amplitude):
     The peak-to-peak value must be obtained from DEL (Deles) analog station and
     in mm unit.
 
-    :param p2p_amplitude: Peak-to-peak amplitude in mm unit.
-    :type p2p_amplitude: float
+    :param p2p_amplitude: Peak-to-peak amplitude in mm unit. It can also be a
+        list or array of amplitudes.
+    :type p2p_amplitude: float, list, or :class:`numpy.ndarray`
     :return: BPPTKG Richter magnitude scale.
-    :rtype: float
+    :rtype: float or :class:`numpy.ndarray`
 
     Example:
 
@@ -169,14 +582,13 @@ def compute_analog_ml(p2p_amplitude):
         ml = compute_analog_ml(p2p_amplitude)
         print(ml)
 
+        magnitudes = compute_analog_ml([10, 50, 113])
+        print(magnitudes)
+
     """
-    # k1, k2, and k3 is correction factors that map DEL amplitude scale to PUS
-    # amplitude scale.
-    k1 = 2800 / (0.13 * 27000)
-    k2 = 20.0 / 50.0
-    k3 = 3981.0 / 7943.0
-    ampl = p2p_amplitude / 2.0
-    return compute_bpptkg_ml(k1 * k2 * k3 * ampl)
+    if isinstance(p2p_amplitude, (list, tuple)):
+        p2p_amplitude = np.asarray(p2p_amplitude, dtype=np.float64)
+    return compute_bpptkg_ml(_ANALOG_AMPLITUDE_FACTOR * p2p_amplitude)
 
 
 def compute_app(stream, station, network="VG", component="Z", **kwargs):
@@ -211,10 +623,56 @@ def compute_app(stream, station, network="VG", component="Z", **kwargs):
     )
     if not filtered_stream:
         return None
-    app = np.abs(np.min(filtered_stream[0].data)) + np.abs(
-        np.max(filtered_stream[0].data)
+    return _compute_app_from_data(filtered_stream[0].data)
+
+
+def _compute_app_from_data(data):
+    lo, hi = _min_max(data)
+    return np.abs(lo) + np.abs(hi)
+
+
+def compute_ml_and_app(stream, station, network="VG", component="Z", **kwargs):
+    """
+    Compute Richter magnitude scales and stream amplitude peak to peak.
+
+    It gives the same result as calling :func:`compute_ml` and
+    :func:`compute_app`, but the stream is filtered only once.
+
+    :param stream: ObsPy waveform stream object.
+    :type stream: :class:`obspy.core.stream.Stream`
+    :param station: Seismic station name, e.g. MEPAS, MEGRA, etc.
+    :type station: str
+    :param network: Seismic network name, default to VG.
+    :type network: str
+    :param component: Seismic station component, e.g E, N, Z, default to Z.
+    :type component: str
+    :return: Tuple of BPPTKG Richter magnitude scale and stream amplitude peak
+        to peak.
+    :rtype: tuple
+
+    Example:
+
+    .. code-block:: python
+
+        from richter import compute_ml_and_app
+        from obspy import read
+
+        stream = read('/path/to/stream.msd')
+        ml, app = compute_ml_and_app(stream, 'MEPAS', component='Z')
+        print(ml, app)
+
+    """
+    filtered_stream = filter_stream(
+        stream, station=station, network=network, component=component, **kwargs
     )
-    return app
+    if not filtered_stream:
+        return None, None
+    # Amplitude peak to peak is computed from raw counts, so take it before
+    # simulating Wood-Anderson seismometer in place.
+    app = _compute_app_from_data(filtered_stream[0].data)
+
+    trace = _simulate_wa(filtered_stream[0], station, component)
+    return _compute_ml_from_wa(np.float64(_abs_max(trace.data))), app
 
 
 def compute_seismic_energy(m):
@@ -227,10 +685,11 @@ def compute_seismic_energy(m):
 
     where :math:`M` is Richter local magnitude  and :math:`E` is energy in ergs.
 
-    :param m: Richter local magnitude.
-    :type m: float
+    :param m: Richter local magnitude. It can also be a list or array of
+        magnitudes.
+    :type m: float, list, or :class:`numpy.ndarray`
     :return: Seismic energy in factor of :math:`10^{12}` ergs.
-    :rtype: float
+    :rtype: float or :class:`numpy.ndarray`
 
     Example:
 
@@ -242,8 +701,14 @@ def compute_seismic_energy(m):
         energy = compute_seismic_energy(ml)
         print(energy)
 
+        energies = compute_seismic_energy([1.5, 2.0, 2.5])
+        print(energies)
+
     """
-    return 10 ** (11.8 + 1.5 * m) / 10**12
+    if isinstance(m, (list, tuple)):
+        m = np.asarray(m, dtype=np.float64)
+    # 10^(11.8 + 1.5M) / 10^12 with the constants folded.
+    return 10.0 ** (1.5 * m - 0.2)
 
 
 def compute_seismic_energy_from_stream(
@@ -2,8 +2,6 @@
 List poles and zeros constants of BPPTKG seismic stations.
 """
 
-import copy
-
 # List poles and zeros of BPPTKG seismic stations. Some stations may not be
 # available, but we hope to add it in the future version.
 #
@@ -105,6 +103,10 @@ PAZ = {
 }
 
 
+# Component names accepted by get_paz.
+_SUPPORTED_CHANNELS = frozenset("ENZenz")
+
+
 def get_paz(station, component=None):
     """
     Get PAZ response for certain station and component. If component is None, it
@@ -125,8 +127,7 @@ def get_paz(station, component=None):
         raise NameError("Unknown station name {}".format(station))
 
     if component:
-        supported_channels = {"E", "N", "Z", "e", "n", "z"}
-        if component not in supported_channels:
+        if component not in _SUPPORTED_CHANNELS:
             raise NameError("Unknown component name {}".format(component))
 
         sensitivity = PAZ[station]["sensitivity"].get(component.upper())
@@ -136,7 +137,7 @@ def get_paz(station, component=None):
                 "on station {station}".format(component=component, station=station)
             )
 
-        paz = copy.deepcopy(PAZ)
-        paz[station]["sensitivity"] = sensitivity
-        return paz[station]
+        paz = dict(PAZ[station])
+        paz["sensitivity"] = sensitivity
+        return paz
     return PAZ[station]
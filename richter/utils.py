@@ -3,43 +3,125 @@ Package utility module.
 """
 
 import os
-import base64
-import uuid
+import shutil
+import functools
+import datetime
+import threading
 from dateutil import parser
 
+# Random bytes are read from os.urandom in blocks of this size and handed out
+# in 16 bytes slices, so that generating filenames in a loop does not issue
+# getrandom syscall for each name.
+_RANDOM_POOL_SIZE = 4096
+_random_pool = b""
+_random_pool_offset = 0
+_random_pool_pid = None
+_random_pool_lock = threading.Lock()
+
+
+def _random_bytes(n):
+    """
+    Return n random bytes from the pool. The pool is refilled after fork, so
+    parent and child processes never share the same bytes.
+    """
+    global _random_pool, _random_pool_offset, _random_pool_pid
+    with _random_pool_lock:
+        pid = os.getpid()
+        if pid != _random_pool_pid or _random_pool_offset + n > len(_random_pool):
+            _random_pool = os.urandom(max(n, _RANDOM_POOL_SIZE))
+            _random_pool_offset = 0
+            _random_pool_pid = pid
+        start = _random_pool_offset
+        _random_pool_offset += n
+        return _random_pool[start : start + n]
+
 
 def generate_safe_random_filename(extension="txt"):
-    """Generate safe random filename based on UUID4."""
-    name = uuid.uuid4()
-    filename = base64.urlsafe_b64encode(name.bytes).decode("utf-8").rstrip("=\n")
-    return "{filename}.{extension}".format(filename=filename, extension=extension)
+    """
+    Generate safe random filename from 128 bits of random bytes.
+
+    Filename is hex encoded, so it stays unique on case-insensitive file
+    systems as well.
+    """
+    return "{}.{}".format(_random_bytes(16).hex(), extension)
 
 
 def to_pydatetime(*args, **kwargs):
     """
     Convert date string to Python datetime.
+
+    ISO 8601 date string, e.g. ``2019-01-01 00:00:00``, is parsed using
+    :meth:`datetime.datetime.fromisoformat` if available, and the result is
+    cached, because the same time window is usually reused across many
+    requests. Other formats fall back to :func:`dateutil.parser.parse`, which
+    is not cached, because partial date string such as ``10:00`` depends on
+    current date.
     """
+    if len(args) == 1 and not kwargs and isinstance(args[0], str):
+        timestr = args[0]
+        # Reject blank string before trying any parser.
+        if not timestr or timestr.isspace():
+            raise ValueError("Empty date string")
+        date_obj = _parse_iso_datetime(timestr)
+        if date_obj is not None:
+            return date_obj
     date_obj = parser.parse(*args, **kwargs)
     return date_obj
 
 
+# Date format used by request time window, tried on Python versions without
+# datetime.fromisoformat, i.e. before Python 3.7.
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_fromisoformat = getattr(datetime.datetime, "fromisoformat", None)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_iso_datetime(timestr):
+    # Return None if timestr is not ISO 8601 date string.
+    try:
+        if _fromisoformat is not None:
+            return _fromisoformat(timestr)
+        return datetime.datetime.strptime(timestr, _DATETIME_FORMAT)
+    except ValueError:
+        return None
+
+
 def find_executable(executable, path=None):
-    """Find full path executable command."""
+    """
+    Find full path executable command.
+
+    Lookup result is cached for each executable and search path. The returned
+    path is always absolute, which lets :mod:`subprocess` launch it with
+    ``posix_spawn`` instead of ``fork`` and ``exec``.
+    """
 
     if path is None:
         path = os.environ["PATH"]
 
-    paths = path.split(os.pathsep)
+    filename = _find_executable(executable, path)
+    if filename is None:
+        return None
+    return os.path.abspath(filename)
+
+
+def clear_executable_cache():
+    """
+    Clear cached lookup results of :func:`find_executable`, e.g. after
+    installing new executable into existing search path.
+    """
+    _find_executable.cache_clear()
+
 
-    for name in paths:
-        filename = os.path.join(name, executable)
-        if os.path.isfile(filename):
-            return filename
-    return None
+@functools.lru_cache(maxsize=None)
+def _find_executable(executable, path):
+    # Only check that the file exists, not that it is executable, because
+    # scripts such as arclink_fetch are run through Python interpreter.
+    return shutil.which(executable, mode=os.F_OK, path=path)
 
 
 def stringify_parameters(items):
     """
     Convert all items in list to string.
     """
-    return [str(item) for item in items]
+    return list(map(str, items))
@@ -4,6 +4,8 @@ Package version module.
 
 __version__ = "1.0.0"
 
+_version_tuple = tuple(map(int, __version__.split(".")))
+
 
 def get_version():
     """Get package version string."""
@@ -12,4 +14,4 @@ def get_version():
 
 def get_version_as_tuple():
     """Get package version as tuple."""
-    return tuple(map(int, __version__.split(".")))
+    return _version_tuple
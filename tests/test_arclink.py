@@ -1,7 +1,53 @@
+import io
 import os
+import sys
+import asyncio
 import unittest
 import datetime
-from richter.link import ArcLinkClient, stream_manager
+import tempfile
+import threading
+import subprocess
+from unittest import mock
+
+from richter import utils
+from richter.link import (
+    ArcLinkClient,
+    LinkError,
+    async_stream_manager,
+    format_request_lines,
+    stream_manager,
+)
+
+# Stub of arclink_fetch that appends request lines to output file, logs each
+# call, fails requests of station FAIL, and hangs on requests of station SLOW.
+STUB_ARCLINK_FETCH = """
+import os
+import sys
+import time
+
+args = sys.argv[1:]
+output_file = [arg for arg in args if arg.startswith("--output-file=")][0][14:]
+request_file = args[-1]
+if request_file == "-":
+    content = sys.stdin.read()
+else:
+    with open(request_file) as buf:
+        content = buf.read()
+
+with open(os.path.join(os.path.dirname(__file__), "calls.txt"), "a") as buf:
+    buf.write(content)
+
+if " SLOW " in content:
+    time.sleep(60)
+
+if " FAIL " in content:
+    sys.stderr.write("request failed\\n")
+    sys.exit(1)
+
+with open(output_file, "a") as buf:
+    buf.write(content)
+sys.stderr.write("request done\\n")
+"""
 
 
 class ArcLinkTest(unittest.TestCase):
@@ -14,10 +60,12 @@ class ArcLinkTest(unittest.TestCase):
             station="MEPAS",
             channel="HHZ",
         )
-        client.request_file = "/tmp/req.txt"
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as buf:
+            client.request_file = buf.name
+        self.addCleanup(os.unlink, client.request_file)
         client._build_request_file()
         stream_list = "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS HHZ 00\n"
-        with open("/tmp/req.txt", "r") as buf:
+        with open(client.request_file, "r") as buf:
             content = buf.read()
         self.assertEqual(content, stream_list)
 
@@ -26,14 +74,64 @@ class ArcLinkTest(unittest.TestCase):
         client.request_file = "/tmp/req.txt"
         client.output_file = "/tmp/output.mseed"
         options = [
+            "--request-format=native",
+            "--data-format=mseed",
+            "--timeout=300",
             "--retries=5",
             "--output-file=/tmp/output.mseed",
-            "--data-format=mseed",
+            "/tmp/req.txt",
+        ]
+        self.assertListEqual(client._build_cli_arguments(), options)
+
+    def test__build_cli_arguments_per_request(self):
+        client = ArcLinkClient()
+        client.request_file = "/tmp/req.txt"
+        client.output_file = "/tmp/output.mseed"
+        options = [
             "--request-format=native",
+            "--data-format=mseed",
             "--timeout=300",
+            "--retries=5",
+            "--output-file=/tmp/part.mseed",
+            "/tmp/part.txt",
+        ]
+        self.assertListEqual(
+            client._build_cli_arguments(
+                request_file="/tmp/part.txt", output_file="/tmp/part.mseed"
+            ),
+            options,
+        )
+        self.assertEqual(client.output_file, "/tmp/output.mseed")
+
+    def test__build_cli_arguments_reused_client(self):
+        client = ArcLinkClient()
+        client.request_file = "/tmp/req.txt"
+        client.output_file = "/tmp/output.mseed"
+        client._build_cli_arguments()
+
+        client.timeout = 60
+        client.proxy = True
+        options = [
+            "--request-format=native",
+            "--data-format=mseed",
+            "--proxy",
+            "--timeout=60",
+            "--retries=5",
+            "--output-file=/tmp/output.mseed",
             "/tmp/req.txt",
         ]
-        self.assertSetEqual(set(client._build_cli_arguments()), set(options))
+        self.assertListEqual(client._build_cli_arguments(), options)
+
+    def test__build_cli_arguments_value_types(self):
+        client = ArcLinkClient()
+        client.request_file = "/tmp/req.txt"
+        client.output_file = "/tmp/output.mseed"
+        client.proxy = True
+        self.assertIn("--proxy", client._build_cli_arguments())
+        client.proxy = 1
+        self.assertIn("--proxy=1", client._build_cli_arguments())
+        client.timeout = 300.0
+        self.assertIn("--timeout=300.0", client._build_cli_arguments())
 
     def test_request(self):
         client = ArcLinkClient()
@@ -80,16 +178,27 @@ class ArcLinkTest(unittest.TestCase):
                 },
             ]
         )
-        client.request_file = "/tmp/req.txt"
-        client._build_request_file()
+        buf = client._build_request_file(io.StringIO())
         stream_list = (
             "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS HHZ 00\n"
             "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS EHZ 00\n"
             "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MELAB HHZ 00\n"
             "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEGRA HHZ 00\n"
         )
-        with open("/tmp/req.txt", "r") as buf:
-            content = buf.read()
+        self.assertEqual(buf.getvalue(), stream_list)
+
+    def test_format_request_lines(self):
+        content = format_request_lines(
+            "2019-01-01 00:00:00",
+            "2019-01-01 01:00:00",
+            "VG",
+            "MEPAS",
+            ["HHZ", "EHZ"],
+        )
+        stream_list = (
+            "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS HHZ 00\n"
+            "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS EHZ 00\n"
+        )
         self.assertEqual(content, stream_list)
 
     def test_instantiate_class(self):
@@ -112,12 +221,9 @@ class ArcLinkTest(unittest.TestCase):
             station="MEPAS",
             channel="HHZ",
         )
-        client.request_file = "/tmp/req.txt"
-        client._build_request_file()
+        buf = client._build_request_file(io.StringIO())
         stream_list = "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS HHZ 00\n"
-        with open("/tmp/req.txt", "r") as buf:
-            content = buf.read()
-        self.assertEqual(content, stream_list)
+        self.assertEqual(buf.getvalue(), stream_list)
 
         client.clear_request()
         client.request(
@@ -127,20 +233,16 @@ class ArcLinkTest(unittest.TestCase):
             station="MEPAS",
             channel="HHZ",
         )
-        client.request_file = "/tmp/req.txt"
-        client._build_request_file()
+        buf = client._build_request_file(io.StringIO())
         stream_list = "2019,01,01,00,00,00 2019,01,01,01,00,00 VG MEPAS HHZ 00\n"
-        with open("/tmp/req.txt", "r") as buf:
-            content = buf.read()
-        self.assertEqual(content, stream_list)
+        self.assertEqual(buf.getvalue(), stream_list)
 
         with self.assertRaises(ValueError):
             client.clear_request()
             client.request(
                 starttime="", endtime="", network="VG", station="MEPAS", channel="HHZ"
             )
-            client.request_file = "/tmp/req.txt"
-            client._build_request_file()
+            client._build_request_file(io.StringIO())
 
         with self.assertRaises(ValueError):
             client.clear_request()
@@ -151,8 +253,7 @@ class ArcLinkTest(unittest.TestCase):
                 station="MEPAS",
                 channel="HHZ",
             )
-            client.request_file = "/tmp/req.txt"
-            client._build_request_file()
+            client._build_request_file(io.StringIO())
 
         with self.assertRaises(ValueError):
             client.clear_request()
@@ -163,8 +264,248 @@ class ArcLinkTest(unittest.TestCase):
                 station="MEPAS",
                 channel="HHZ",
             )
-            client.request_file = "/tmp/req.txt"
-            client._build_request_file()
+            client._build_request_file(io.StringIO())
+
+
+def run_coroutine(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class ArcLinkExecuteTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+
+        with open(os.path.join(self.tmpdir, "arclink_fetch"), "w") as buf:
+            buf.write(STUB_ARCLINK_FETCH)
+        patches = [
+            mock.patch.dict(
+                os.environ, {"PATH": self.tmpdir + os.pathsep + os.environ["PATH"]}
+            ),
+            mock.patch.object(ArcLinkClient, "python_cmd", sys.executable),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        utils.clear_executable_cache()
+        self.addCleanup(utils.clear_executable_cache)
+
+    def make_client(self, stations=("MEPAS", "MELAB"), **kwargs):
+        client = ArcLinkClient(
+            address="192.168.0.25:18001", user="user", output_path=self.tmpdir, **kwargs
+        )
+        client.request_many(
+            [
+                {
+                    "starttime": "2019-01-01 00:00:00",
+                    "endtime": "2019-01-01 01:00:00",
+                    "network": "VG",
+                    "station": station,
+                    "channel": "HHZ",
+                }
+                for station in stations
+            ]
+        )
+        return client
+
+    def expected_lines(self, stations=("MEPAS", "MELAB")):
+        return "".join(
+            "2019,01,01,00,00,00 2019,01,01,01,00,00 VG {} HHZ 00\n".format(station)
+            for station in stations
+        )
+
+    def read(self, path):
+        with open(path, "r") as buf:
+            return buf.read()
+
+    def count_calls(self):
+        try:
+            return len(self.read(os.path.join(self.tmpdir, "calls.txt")).splitlines())
+        except FileNotFoundError:
+            return 0
+
+    def test_execute(self):
+        client = self.make_client()
+        completed_process = client.execute()
+        self.assertEqual(completed_process.returncode, 0)
+        self.assertIsNone(completed_process.stdout)
+        self.assertIsNone(completed_process.stderr)
+        self.assertEqual(self.read(client.output_file), self.expected_lines())
+        self.assertEqual(self.read(client.request_file), self.expected_lines())
+
+    def test_execute_subprocess_run_arguments(self):
+        client = self.make_client()
+        completed_process = client.execute(
+            stderr=subprocess.PIPE, universal_newlines=True, check=True, timeout=30
+        )
+        self.assertEqual(completed_process.stderr, "request done\n")
+
+        client = self.make_client(stations=("FAIL",))
+        with self.assertRaises(subprocess.CalledProcessError):
+            client.execute(stderr=subprocess.DEVNULL, check=True)
+
+    def test_execute_stdin_request(self):
+        client = self.make_client(persist_request_file=False)
+        completed_process = client.execute()
+        self.assertEqual(completed_process.args[-1], "-")
+        self.assertEqual(self.read(client.output_file), self.expected_lines())
+        self.assertFalse(os.path.exists(client.request_file))
+
+        client = self.make_client(persist_request_file=False)
+        completed_process = client.execute(
+            stderr=subprocess.PIPE, universal_newlines=True
+        )
+        self.assertEqual(completed_process.stderr, "request done\n")
+        self.assertEqual(self.read(client.output_file), self.expected_lines())
+
+    def test_execute_in_thread(self):
+        client = self.make_client()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(client.execute()))
+        thread.start()
+        thread.join()
+        self.assertEqual(results[0].returncode, 0)
+        self.assertEqual(self.read(client.output_file), self.expected_lines())
+
+    def test_execute_in_event_loop(self):
+        client = self.make_client()
+
+        async def main():
+            return client.execute()
+
+        self.assertEqual(run_coroutine(main()).returncode, 0)
+
+    def test_aexecute(self):
+        stations = ("MEPAS", "MELAB", "MEGRA", "MEDEL")
+        client = self.make_client(stations=stations, max_parallel=2)
+        processes = run_coroutine(client.aexecute())
+        self.assertEqual([process.returncode for process in processes], [0] * 4)
+        self.assertEqual(processes[0].stderr, b"request done\n")
+        # Outputs are merged in request order, and per-request files are
+        # removed.
+        self.assertEqual(self.read(client.output_file), self.expected_lines(stations))
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir)),
+            sorted(
+                ["arclink_fetch", "calls.txt", os.path.basename(client.output_file)]
+            ),
+        )
+
+    def test_aexecute_failed_request(self):
+        client = self.make_client(stations=("MEPAS", "FAIL"))
+        processes = run_coroutine(client.aexecute())
+        self.assertEqual([process.returncode for process in processes], [0, 1])
+        self.assertEqual(processes[1].stderr, b"request failed\n")
+        self.assertEqual(self.read(client.output_file), self.expected_lines(["MEPAS"]))
+
+    def test_aexecute_single_request(self):
+        client = self.make_client(stations=("MEPAS",))
+        run_coroutine(client.aexecute())
+        self.assertEqual(self.read(client.output_file), self.expected_lines(["MEPAS"]))
+
+        client = self.make_client(stations=("FAIL",))
+        run_coroutine(client.aexecute())
+        self.assertEqual(self.read(client.output_file), "")
+
+    def test_aexecute_invalid_request(self):
+        client = self.make_client()
+        del client.request_data[1]["channel"]
+        with self.assertRaises(LinkError):
+            run_coroutine(client.aexecute())
+        self.assertEqual(self.count_calls(), 0)
+
+    def test_aexecute_cancel(self):
+        client = self.make_client(stations=("MEPAS", "SLOW"))
+
+        async def main():
+            await asyncio.wait_for(client.aexecute(), timeout=1.0)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            run_coroutine(main())
+        # The hanging process is killed before its files are removed.
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir)), ["arclink_fetch", "calls.txt"]
+        )
+
+    def test_aexecute_request_retries(self):
+        client = self.make_client(stations=("FAIL",))
+        run_coroutine(client.aexecute())
+        self.assertEqual(self.count_calls(), 1)
+
+        client = self.make_client(stations=("FAIL",), request_retries=2)
+        with mock.patch.object(ArcLinkClient, "backoff_factor", 0.0):
+            processes = run_coroutine(client.aexecute())
+        self.assertEqual(processes[0].returncode, 1)
+        self.assertEqual(self.count_calls(), 1 + 3)
+
+    def test_aexecute_retry_releases_semaphore(self):
+        client = self.make_client(
+            stations=("FAIL", "MEPAS"), max_parallel=1, request_retries=1
+        )
+        with mock.patch.object(ArcLinkClient, "backoff_factor", 0.2):
+            run_coroutine(client.aexecute())
+        calls = self.read(os.path.join(self.tmpdir, "calls.txt")).splitlines()
+        self.assertEqual([line.split()[3] for line in calls], ["FAIL", "MEPAS", "FAIL"])
+
+    def test_aexecute_stdin_request(self):
+        client = self.make_client(persist_request_file=False)
+        processes = run_coroutine(client.aexecute())
+        self.assertEqual([process.args[-1] for process in processes], ["-", "-"])
+        self.assertEqual(self.read(client.output_file), self.expected_lines())
+
+    def test_python_cmd_override(self):
+        class Client(ArcLinkClient):
+            python_cmd = sys.executable
+
+        with mock.patch.object(ArcLinkClient, "python_cmd", "/nonexistent/python"):
+            client = Client(address="192.168.0.25:18001", user="user")
+            client._check_required()
+            self.assertEqual(client._build_cli()[0], sys.executable)
+
+            client = ArcLinkClient(address="192.168.0.25:18001", user="user")
+            client.python_cmd = sys.executable
+            client._check_required()
+            self.assertEqual(client._build_cli()[0], sys.executable)
+
+    def test_stream_manager(self):
+        with stream_manager(
+            address="192.168.0.25:18001",
+            starttime="2019-01-01 00:00:00",
+            endtime="2019-01-01 01:00:00",
+            network="VG",
+            station="MEPAS",
+            channel="HHZ",
+        ) as stream_file:
+            self.assertEqual(self.read(stream_file), self.expected_lines(["MEPAS"]))
+        self.assertFalse(os.path.exists(stream_file))
+
+    def test_async_stream_manager(self):
+        async def fetch(station):
+            async with async_stream_manager(
+                address="192.168.0.25:18001",
+                starttime="2019-01-01 00:00:00",
+                endtime="2019-01-01 01:00:00",
+                network="VG",
+                station=station,
+                channel="HHZ",
+            ) as stream_file:
+                return stream_file, self.read(stream_file)
+
+        async def main():
+            return await asyncio.gather(fetch("MEPAS"), fetch("MELAB"))
+
+        for (stream_file, content), station in zip(
+            run_coroutine(main()), ["MEPAS", "MELAB"]
+        ):
+            self.assertEqual(content, self.expected_lines([station]))
+            self.assertFalse(os.path.exists(stream_file))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,16 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
 
-from richter import ml
+import numpy as np
+
+from richter import ml, paz
+
+try:
+    import obspy
+except ImportError:
+    obspy = None
 
 
 class SeismicEnergyTest(unittest.TestCase):
@@ -9,6 +19,27 @@ class SeismicEnergyTest(unittest.TestCase):
             10 ** (12.8) / 10**12, ml.compute_seismic_energy(2.0 / 3.0), delta=1e-3
         )
 
+    def test_compute_seismic_energy_array(self):
+        magnitudes = [0.5, 1.5, 2.0]
+        np.testing.assert_allclose(
+            ml.compute_seismic_energy(magnitudes),
+            [ml.compute_seismic_energy(m) for m in magnitudes],
+        )
+        np.testing.assert_allclose(
+            ml.compute_seismic_energy(np.array(magnitudes)),
+            [10 ** (11.8 + 1.5 * m) / 10**12 for m in magnitudes],
+        )
+
+    def test_compute_bpptkg_ml(self):
+        self.assertAlmostEqual(ml.compute_bpptkg_ml(1.0), 1.4)
+        self.assertAlmostEqual(ml.compute_bpptkg_ml(np.float64(10.0)), 2.4)
+        np.testing.assert_allclose(
+            ml.compute_bpptkg_ml(np.array([1.0, 10.0])), [1.4, 2.4]
+        )
+        np.testing.assert_allclose(ml.compute_bpptkg_ml([1.0, 10.0]), [1.4, 2.4])
+        with np.errstate(divide="ignore"):
+            self.assertEqual(ml.compute_bpptkg_ml(0.0), -np.inf)
+
     def test_compute_analog_ml(self):
         self.assertAlmostEqual(ml.compute_analog_ml(10), 1.30288852558, delta=1e-3)
 
@@ -16,6 +47,185 @@ class SeismicEnergyTest(unittest.TestCase):
 
         self.assertAlmostEqual(ml.compute_analog_ml(113), 2.35596696906, delta=1e-3)
 
+    def test_compute_analog_ml_array(self):
+        np.testing.assert_allclose(
+            ml.compute_analog_ml([10, 50, 113]),
+            [1.30288852558, 2.00185852991, 2.35596696906],
+            atol=1e-3,
+        )
+
+
+class AmplitudeTest(unittest.TestCase):
+    def test_abs_max_and_app_propagate_nan(self):
+        data = np.ones(100000)
+        data[-1] = np.nan
+        self.assertTrue(np.isnan(ml._abs_max(data)))
+        self.assertTrue(np.isnan(ml._compute_app_from_data(data)))
+
+
+@unittest.skipIf(obspy is None, "ObsPy is not installed")
+class FilterStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.stream = obspy.Stream(
+            [
+                obspy.Trace(
+                    data=np.arange(100, dtype=np.int32),
+                    header={"network": "VG", "station": station, "channel": "HHZ"},
+                )
+                for station in ["MEPAS", "MELAB", "MEGRA"]
+            ]
+        )
+
+    def test_filter_stream(self):
+        filtered_stream = ml.filter_stream(self.stream, station="MEPAS")
+        self.assertEqual(filtered_stream.count(), 1)
+        self.assertEqual(filtered_stream[0].stats.station, "MEPAS")
+
+    def test_filter_stream_does_not_modify_stream(self):
+        filtered_stream = ml.filter_stream(self.stream, station="MEPAS")
+        filtered_stream[0].data[:] = 0
+        self.assertEqual(self.stream.count(), 3)
+        np.testing.assert_array_equal(
+            self.stream[0].data, np.arange(100, dtype=np.int32)
+        )
+
+
+@unittest.skipIf(obspy is None, "ObsPy is not installed")
+class ComputeMLTest(unittest.TestCase):
+    def setUp(self):
+        t = np.arange(1000) / 100.0
+        self.stream = obspy.Stream(
+            [
+                obspy.Trace(
+                    data=(1e4 * np.sin(2 * np.pi * 2.0 * t)).astype(np.int32),
+                    header={
+                        "network": "VG",
+                        "station": "MEPAS",
+                        "channel": "HHZ",
+                        "sampling_rate": 100.0,
+                    },
+                )
+            ]
+        )
+
+    def test_simulate_wa(self):
+        stream = self.stream.copy()
+        stream[0].data = stream[0].data.astype(np.float64)
+        expected = stream.copy()
+        expected.simulate(
+            paz_remove=paz.get_paz("MEPAS", "Z"),
+            paz_simulate=paz.PAZ["WOOD_ANDERSON"],
+            water_level=0.0,
+        )
+        for _ in range(2):
+            trace = ml._simulate_wa(stream[0].copy(), "MEPAS", "Z")
+            np.testing.assert_allclose(trace.data, expected[0].data, rtol=0, atol=1e-12)
+
+    def assert_simulate_wa_ml(self, stream):
+        expected = stream.copy()
+        expected.simulate(
+            paz_remove=paz.get_paz("MEPAS", "Z"),
+            paz_simulate=paz.PAZ["WOOD_ANDERSON"],
+            water_level=0.0,
+        )
+        trace = ml._simulate_wa(stream[0].copy(), "MEPAS", "Z")
+        self.assertEqual(
+            trace.data.dtype,
+            np.float32 if ml._SINGLE_PRECISION_FFT else np.float64,
+        )
+
+        wa_ampl = np.max(np.abs(expected[0].data))
+        self.assertAlmostEqual(
+            ml.compute_bpptkg_ml(ml._abs_max(trace.data) * 1000),
+            ml.compute_bpptkg_ml(wa_ampl * 1000),
+            delta=1e-3,
+        )
+
+    def test_simulate_wa_single_precision(self):
+        self.assert_simulate_wa_ml(self.stream)
+
+    def test_simulate_wa_single_precision_dc_offset(self):
+        stream = self.stream.copy()
+        t = np.arange(stream[0].stats.npts) / stream[0].stats.sampling_rate
+        stream[0].data = (1e8 + 200 * np.sin(2 * np.pi * 2.0 * t)).astype(np.int32)
+        self.assert_simulate_wa_ml(stream)
+
+    def test_simulate_wa_follows_paz_changes(self):
+        expected = ml.compute_ml(self.stream, "MEPAS")
+        sensitivity = paz.PAZ["MEPAS"]["sensitivity"]
+        with mock.patch.dict(sensitivity, {"Z": sensitivity["Z"] * 10}):
+            self.assertAlmostEqual(
+                ml.compute_ml(self.stream, "MEPAS"), expected - 1, delta=1e-6
+            )
+        self.assertAlmostEqual(
+            ml.compute_ml(self.stream, "MEPAS"), expected, delta=1e-6
+        )
+
+    def test_compute_wa_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.dict(
+            os.environ, {"RICHTER_CACHE_DIR": cache_dir}
+        ):
+            expected = ml.compute_wa(self.stream, "MEPAS")
+            self.assertEqual(ml.compute_wa(self.stream, "MEPAS", cache=True), expected)
+            self.assertEqual(len(os.listdir(os.path.join(cache_dir, "wa"))), 1)
+            self.assertEqual(ml.compute_wa(self.stream, "MEPAS", cache=True), expected)
+
+            ml.clear_wa_cache()
+            self.assertFalse(os.path.exists(os.path.join(cache_dir, "wa")))
+
+    def test_compute_ml_batch_cache(self):
+        other = self.stream.copy()
+        other[0].data = other[0].data * 2
+        streams = [self.stream, other, obspy.Stream()]
+        expected = ml.compute_ml_batch(streams, "MEPAS")
+        with tempfile.TemporaryDirectory() as cache_dir, mock.patch.dict(
+            os.environ, {"RICHTER_CACHE_DIR": cache_dir}
+        ):
+            ml.compute_wa(self.stream, "MEPAS", cache=True)
+            for _ in range(2):
+                np.testing.assert_allclose(
+                    ml.compute_ml_batch(streams, "MEPAS", cache=True),
+                    expected,
+                    atol=1e-6,
+                )
+                self.assertEqual(len(os.listdir(os.path.join(cache_dir, "wa"))), 2)
+
+    def test_compute_ml_and_app(self):
+        ml_value, app = ml.compute_ml_and_app(self.stream, "MEPAS")
+        self.assertAlmostEqual(
+            ml_value, ml.compute_ml(self.stream, "MEPAS"), delta=1e-9
+        )
+        self.assertEqual(app, ml.compute_app(self.stream, "MEPAS"))
+
+    def test_compute_ml_from_trace(self):
+        for dtype in [np.int32, np.float64]:
+            stream = self.stream.copy()
+            stream[0].data = stream[0].data.astype(dtype)
+            data = stream[0].data.copy()
+            self.assertAlmostEqual(
+                ml.compute_ml_from_trace(stream[0], "MEPAS"),
+                ml.compute_ml(stream, "MEPAS"),
+                delta=1e-9,
+            )
+            np.testing.assert_array_equal(stream[0].data, data)
+
+    def test_compute_ml_batch(self):
+        other = self.stream.copy()
+        other[0].data = other[0].data * 2
+        shorter = self.stream.copy()
+        shorter[0].data = shorter[0].data[:500]
+        streams = [self.stream, other, obspy.Stream(), shorter]
+
+        expected = [ml.compute_ml(stream, "MEPAS") for stream in streams]
+        magnitudes = ml.compute_ml_batch(streams, "MEPAS")
+        self.assertTrue(np.isnan(magnitudes[2]))
+        np.testing.assert_allclose(
+            magnitudes[[0, 1, 3]], [expected[0], expected[1], expected[3]], atol=1e-6
+        )
+
+    def test_compute_ml_and_app_unknown_stream(self):
+        self.assertEqual(ml.compute_ml_and_app(self.stream, "MELAB"), (None, None))
+
 
 if __name__ == "__main__":
     unittest.main()
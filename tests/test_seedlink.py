@@ -1,6 +1,36 @@
+import os
+import sys
+import asyncio
 import unittest
 import datetime
-from richter.link import SeedLinkClient, LinkError
+import tempfile
+from unittest import mock
+
+from richter import utils
+from richter.link import SeedLinkClient, LinkError, gather_many
+
+# Stub of slinktool that logs start and end time of each call, writes its
+# stream list to output file, and fails requests of station FAIL.
+STUB_SLINKTOOL = """
+import os
+import sys
+import time
+
+args = sys.argv[1:]
+streams = args[args.index("-S") + 1]
+output_file = args[args.index("-o") + 1]
+start = time.time()
+time.sleep(0.2)
+if "_FAIL" in streams:
+    sys.stderr.write("request failed\\n")
+    sys.exit(1)
+
+with open(output_file, "w") as buf:
+    buf.write(streams)
+with open(os.path.join(os.path.dirname(__file__), "calls.txt"), "a") as buf:
+    buf.write("{} {} {}\\n".format(streams, start, time.time()))
+sys.stderr.write("request done\\n")
+"""
 
 
 class SeedLinkClientTest(unittest.TestCase):
@@ -41,9 +71,9 @@ class SeedLinkClientTest(unittest.TestCase):
         client.output_file = "/tmp/data.mseed"
         cli_arguments = [
             "-nd",
-            30,
+            "30",
             "-nt",
-            60,
+            "60",
             "-tw",
             "2019,01,01,00,00,00:2019,01,01,01,00,00",
             "-S",
@@ -59,6 +89,12 @@ class SeedLinkClientTest(unittest.TestCase):
         self.assertEqual(client.address, "192.168.0.25:18000")
         self.assertEqual(client.data_format, "mseed")
 
+    def test_override_seedlink_cli(self):
+        client = SeedLinkClient(address="192.168.0.25:18000")
+        client.seedlink_cli = "/opt/slinktool"
+        self.assertEqual(client.seedlink_cli, "/opt/slinktool")
+        self.assertEqual(SeedLinkClient.seedlink_cli, "slinktool")
+
     def test__check_required(self):
         client = SeedLinkClient(address="192.168.0.25:18000", data_format="mseed")
 
@@ -170,5 +206,92 @@ class SeedLinkClientTest(unittest.TestCase):
             self.assertEqual(client._build_time_window(), time_window)
 
 
+def run_coroutine(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class SeedLinkExecuteTest(unittest.TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.tmpdir = tmpdir.name
+
+        path = os.path.join(self.tmpdir, "slinktool")
+        with open(path, "w") as buf:
+            buf.write("#!{}\n".format(sys.executable))
+            buf.write(STUB_SLINKTOOL)
+        os.chmod(path, 0o755)
+        patch = mock.patch.dict(
+            os.environ, {"PATH": self.tmpdir + os.pathsep + os.environ["PATH"]}
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+        utils.clear_executable_cache()
+        self.addCleanup(utils.clear_executable_cache)
+
+    def make_client(self, station="MEPAS"):
+        client = SeedLinkClient(address="192.168.0.25:18000", output_path=self.tmpdir)
+        client.request(
+            starttime="2019-01-01 00:00:00",
+            endtime="2019-01-01 01:00:00",
+            network="VG",
+            station=station,
+        )
+        return client
+
+    def read_calls(self):
+        with open(os.path.join(self.tmpdir, "calls.txt"), "r") as buf:
+            return [line.split() for line in buf.read().splitlines()]
+
+    def test_aexecute(self):
+        client = self.make_client()
+        completed_process = run_coroutine(client.aexecute())
+        self.assertEqual(completed_process.returncode, 0)
+        self.assertEqual(completed_process.stderr, b"request done\n")
+        with open(client.output_file, "r") as buf:
+            self.assertEqual(buf.read(), "VG_MEPAS")
+
+        client = self.make_client(station="FAIL")
+        completed_process = run_coroutine(client.aexecute())
+        self.assertEqual(completed_process.returncode, 1)
+        self.assertEqual(completed_process.stderr, b"request failed\n")
+
+    def test_gather_many(self):
+        stations = ["MEPAS", "MELAB", "MEGRA", "MEDEL", "MEIJO"]
+        clients = [self.make_client(station=station) for station in stations]
+        processes = run_coroutine(gather_many(clients, max_concurrency=2))
+
+        # Results are in client order, whatever order the requests finish in.
+        self.assertEqual(
+            [process.args[process.args.index("-S") + 1] for process in processes],
+            ["VG_" + station for station in stations],
+        )
+        self.assertEqual([process.returncode for process in processes], [0] * 5)
+
+        intervals = [(float(start), float(end)) for _, start, end in self.read_calls()]
+        self.assertEqual(len(intervals), 5)
+        for start, _ in intervals:
+            running = sum(1 for s, e in intervals if s <= start < e)
+            self.assertLessEqual(running, 2)
+
+    def test_gather_many_error(self):
+        clients = [self.make_client(), SeedLinkClient(address="192.168.0.25:18000")]
+
+        async def main():
+            with self.assertRaises(LinkError):
+                await gather_many(clients)
+            # Other requests are killed, so they never get to log the call.
+            await asyncio.sleep(0.5)
+
+        run_coroutine(main())
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, "calls.txt")))
+
+
 if __name__ == "__main__":
     unittest.main()